@@ -1,12 +1,12 @@
 """Python post processing integrations for the Fluent solver."""
 
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata
+import importlib.metadata as importlib_metadata
 
+_DISTRIBUTION_NAME = "ansys-fluent-visualization"
 _VERSION_INFO = None
-__version__ = importlib_metadata.version(__name__.replace(".", "-"))
+__version__ = importlib_metadata.version(_DISTRIBUTION_NAME)
+# Both versions are fixed once the package is imported.
+_RESOLVED_VERSION = _VERSION_INFO if _VERSION_INFO is not None else __version__
 
 
 def version_info() -> str:
@@ -19,7 +19,7 @@ def version_info() -> str:
     -------
     Only available in packaged versions. Otherwise it will return __version__.
     """
-    return _VERSION_INFO if _VERSION_INFO is not None else __version__
+    return _RESOLVED_VERSION
 
 
 from ansys.fluent.visualization._config import get_config, set_config  # noqa: F401
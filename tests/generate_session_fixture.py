@@ -0,0 +1,98 @@
+"""Regenerate the binary session fixtures used by ``test_post.py``.
+
+``session.dump`` is the source of truth. Running this script re-pickles it at
+protocol 5 if it was written with an older protocol, then writes
+``session.json`` (the dictionary skeleton) and ``session.npz`` (the field
+arrays, one column per tag and field).
+
+.. code-block:: bash
+
+    python tests/generate_session_fixture.py
+"""
+
+import json
+from pathlib import Path
+import pickle
+from typing import Dict, Tuple
+
+import numpy as np
+
+_FIXTURE_DIR = Path(__file__).parent
+
+
+def columnar_fields(fields: dict) -> Tuple[list, Dict[str, np.ndarray]]:
+    """Stack the per-surface arrays of ``fields`` into one column per field.
+
+    ``fields`` is laid out as ``{tag_id: {surface_id: {field: array}}}``. The
+    returned layout is ``[[tag_id, {field: [[surface_id, start, stop], ...]}],
+    ...]`` and gives the rows of each surface in the column stored under
+    ``f"fields/{tag_id}/{field}"``. Tag and surface ids are ints, they are kept
+    in lists because JSON object keys are always strings.
+    """
+    layout, arrays = [], {}
+    for tag_id, surfaces in fields.items():
+        surface_arrays = {}
+        for surface_id, surface_fields in surfaces.items():
+            for field, array in surface_fields.items():
+                surface_arrays.setdefault(field, {})[surface_id] = array
+        tag_layout = {}
+        for field, field_arrays in surface_arrays.items():
+            rows, stop = [], 0
+            for surface_id, array in field_arrays.items():
+                start, stop = stop, stop + len(array)
+                rows.append([surface_id, start, stop])
+            tag_layout[field] = rows
+            arrays[f"fields/{tag_id}/{field}"] = np.concatenate(
+                list(field_arrays.values())
+            )
+        layout.append([tag_id, tag_layout])
+    return layout, arrays
+
+
+def split_session(session_data: dict) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Split ``session_data`` into a JSON serializable skeleton and its arrays.
+
+    The surface id keyed ranges of each field are stored as
+    ``[[surface_id, ranges], ...]`` lists.
+    """
+    skeleton = dict(session_data)
+    skeleton["range"] = {
+        field: [[surface_id, ranges] for surface_id, ranges in field_ranges.items()]
+        for field, field_ranges in session_data["range"].items()
+    }
+    skeleton["fields"], arrays = columnar_fields(session_data["fields"])
+    return skeleton, arrays
+
+
+def pickle_protocol(path: Path) -> int:
+    """Protocol of the pickle stored at ``path``, read from its header."""
+    with path.open("rb") as pickle_obj:
+        header = pickle_obj.read(2)
+    # Protocol 0 and 1 streams have no PROTO opcode.
+    return header[1] if header[:1] == pickle.PROTO else 1
+
+
+def write_session_dump(session_data: dict, path: Path) -> None:
+    """Pickle ``session_data`` at protocol 5.
+
+    From protocol 5 on, NumPy reduces contiguous arrays to a ``PickleBuffer``
+    which is written as one raw byte string and rebuilt with
+    ``np.frombuffer`` on load.
+    """
+    with path.open("wb") as pickle_obj:
+        pickle.dump(session_data, pickle_obj, protocol=5)
+
+
+def main() -> None:
+    dump_path = _FIXTURE_DIR / "session.dump"
+    with dump_path.open("rb") as pickle_obj:
+        session_data = pickle.load(pickle_obj)
+    if pickle_protocol(dump_path) < 5:
+        write_session_dump(session_data, dump_path)
+    skeleton, arrays = split_session(session_data)
+    (_FIXTURE_DIR / "session.json").write_text(json.dumps(skeleton, indent=1))
+    np.savez(_FIXTURE_DIR / "session.npz", **arrays)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+from collections import defaultdict
+from collections.abc import Mapping
+import functools
+import json
 from pathlib import Path
 import pickle
+from types import MappingProxyType
 from typing import Dict, List, Optional, Union
 
 from ansys.fluent.core.services.field_data import SurfaceDataType
@@ -9,6 +14,7 @@ import pytest
 from ansys.fluent.visualization import get_config, set_config
 from ansys.fluent.visualization.matplotlib import Plots
 from ansys.fluent.visualization.pyvista import Graphics
+from generate_session_fixture import split_session
 
 
 @pytest.fixture(autouse=True)
@@ -20,6 +26,8 @@ def patch_mock_api_helper(mocker) -> None:
 
 
 class MockFieldTransaction:
+    __slots__ = ("service", "fields_request")
+
     def __init__(self, session_data, field_request):
         self.service = session_data
         self.fields_request = field_request
@@ -33,14 +41,17 @@ class MockFieldTransaction:
         provide_faces_centroid=False,
         provide_faces_normal=False,
     ) -> None:
-        self.fields_request["surf"].append(
+        self.fields_request.append(
             (
+                0,
                 surface_ids,
-                overset_mesh,
-                provide_vertices,
-                provide_faces,
-                provide_faces_centroid,
-                provide_faces_normal,
+                (
+                    overset_mesh,
+                    provide_vertices,
+                    provide_faces,
+                    provide_faces_centroid,
+                    provide_faces_normal,
+                ),
             )
         )
 
@@ -51,8 +62,14 @@ class MockFieldTransaction:
         node_value: Optional[bool] = True,
         boundary_value: Optional[bool] = False,
     ) -> None:
-        self.fields_request["scalar"].append(
-            (surface_ids, field_name, node_value, boundary_value)
+        location_tag = 4 if node_value else 2
+        boundary_tag = 8 if boundary_value else 0
+        self.fields_request.append(
+            (
+                location_tag | boundary_tag,
+                surface_ids,
+                (field_name, node_value, boundary_value),
+            )
         )
 
     def add_vector_fields_request(
@@ -60,37 +77,46 @@ class MockFieldTransaction:
         surface_ids: List[int],
         field_name: str,
     ) -> None:
-        self.fields_request["vector"].append((surface_ids, field_name))
+        self.fields_request.append((0, surface_ids, (field_name,)))
 
     def get_fields(self) -> Dict[int, Dict]:
-        fields = {}
-        for request_type, requests in self.fields_request.items():
-            for request in requests:
-                if request_type == "surf":
-                    tag_id = 0
-                if request_type == "scalar":
-                    location_tag = 4 if request[2] else 2
-                    boundary_tag = 8 if request[3] else 0
-                    tag_id = location_tag | boundary_tag
-                if request_type == "vector":
-                    tag_id = 0
-
-                field_requests = fields.get(tag_id)
-                if not field_requests:
-                    field_requests = fields[tag_id] = {}
-                surf_ids = request[0]
-                for surf_id in surf_ids:
-                    surface_requests = field_requests.get(surf_id)
-                    if not surface_requests:
-                        surface_requests = field_requests[surf_id] = {}
-                    surface_requests.update(self.service["fields"][tag_id][surf_id])
-        return fields
+        fields = defaultdict(lambda: defaultdict(dict))
+        for tag_id, surf_ids, _ in self.fields_request:
+            field_requests = fields[tag_id]
+            for surf_id in surf_ids:
+                field_requests[surf_id].update(
+                    self.service["fields"].surface_fields(tag_id, surf_id)
+                )
+        return {
+            tag_id: dict(field_requests) for tag_id, field_requests in fields.items()
+        }
+
+
+_ENUM_TO_FIELD = {
+    SurfaceDataType.FacesConnectivity: "faces",
+    SurfaceDataType.Vertices: "vertices",
+    SurfaceDataType.FacesCentroid: "centroid",
+    SurfaceDataType.FacesNormal: "face-normal",
+}
+
+# provide_vertices, provide_faces, provide_faces_centroid, provide_faces_normal
+_SURFACE_DATA_FLAGS = {
+    data_type: (
+        data_type is SurfaceDataType.Vertices,
+        data_type is SurfaceDataType.FacesConnectivity,
+        data_type is SurfaceDataType.FacesCentroid,
+        data_type is SurfaceDataType.FacesNormal,
+    )
+    for data_type in SurfaceDataType
+}
 
 
 class MockFieldData:
+    __slots__ = ("_session_data", "_request_to_serve", "_field_info")
+
     def __init__(self, solver_data, field_info):
         self._session_data = solver_data
-        self._request_to_serve = {"surf": [], "scalar": [], "vector": []}
+        self._request_to_serve = []
         self._field_info = field_info
 
     def new_transaction(self):
@@ -104,93 +130,189 @@ class MockFieldData:
     ) -> Dict:
         surfaces_info = self._field_info().get_surfaces_info()
         surface_ids = surfaces_info[surface_name]["surface_id"]
-        self._request_to_serve["surf"].append(
+        self._request_to_serve.append(
             (
+                0,
                 surface_ids,
-                overset_mesh,
-                data_type == SurfaceDataType.Vertices,
-                data_type == SurfaceDataType.FacesConnectivity,
-                data_type == SurfaceDataType.FacesCentroid,
-                data_type == SurfaceDataType.FacesNormal,
+                (overset_mesh, *_SURFACE_DATA_FLAGS[data_type]),
             )
         )
-        enum_to_field_name = {
-            SurfaceDataType.FacesConnectivity: "faces",
-            SurfaceDataType.Vertices: "vertices",
-            SurfaceDataType.FacesCentroid: "centroid",
-            SurfaceDataType.FacesNormal: "face-normal",
-        }
-
         tag_id = 0
         if overset_mesh:
             tag_id = self._payloadTags[FieldDataProtoModule.PayloadTag.OVERSET_MESH]
-        return {
-            surface_id: self._session_data["fields"][tag_id][surface_id][
-                enum_to_field_name[data_type]
-            ]
-            for surface_id in surface_ids
-        }
+        rows, column = self._session_data["fields"].views[
+            tag_id, _ENUM_TO_FIELD[data_type]
+        ]
+        return {surface_id: column[rows[surface_id]] for surface_id in surface_ids}
 
 
 class MockFieldInfo:
+    __slots__ = ("_session_data", "_range_tables", "_surface_ids")
+
     def __init__(self, solver_data):
         self._session_data = solver_data
+        self._range_tables = {}
+        self._surface_ids = None
+
+    def surface_id_array(self) -> np.ndarray:
+        if self._surface_ids is None:
+            self._surface_ids = np.fromiter(
+                (
+                    v["surface_id"][0]
+                    for v in self._session_data["surfaces_info"].values()
+                ),
+                dtype=np.int64,
+            )
+            self._surface_ids.flags.writeable = False
+        return self._surface_ids
+
+    def _get_range_table(self, field: str, node_value: bool):
+        key = (field, node_value)
+        table = self._range_tables.get(key)
+        if table is None:
+            location = "node_value" if node_value else "cell_value"
+            field_ranges = self._session_data["range"][field]
+            rows = {surface_id: row for row, surface_id in enumerate(field_ranges)}
+            bounds = np.array(
+                [field_ranges[surface_id][location] for surface_id in rows]
+            ).reshape(-1, 2)
+            table = self._range_tables[key] = (rows, bounds[:, 0], bounds[:, 1])
+        return table
 
     def get_scalar_field_range(
-        self, field: str, node_value: bool = False, surface_ids: List[int] = []
+        self,
+        field: str,
+        node_value: bool = False,
+        surface_ids: Optional[List[int]] = None,
     ) -> List[float]:
-        if not surface_ids:
-            surface_ids = [
-                v["surface_id"][0]
-                for k, v in self._session_data["surfaces_info"].items()
-            ]
-        minimum, maximum = None, None
-        for surface_id in surface_ids:
-            range = self._session_data["range"][field][surface_id][
-                "node_value" if node_value else "cell_value"
-            ]
-            minimum = min(range[0], minimum) if minimum else range[0]
-            maximum = max(range[1], maximum) if maximum else range[1]
-        return [minimum, maximum]
-
-    def get_scalar_fields_info(self) -> dict:
+        # Like the Fluent service, an empty list also means all surfaces.
+        if surface_ids is None or len(surface_ids) == 0:
+            surface_ids = self.surface_id_array()
+        rows, minimums, maximums = self._get_range_table(field, bool(node_value))
+        selected = [rows[surface_id] for surface_id in surface_ids]
+        return [
+            float(minimums.take(selected).min(initial=float("inf"))),
+            float(maximums.take(selected).max(initial=float("-inf"))),
+        ]
+
+    def get_scalar_fields_info(self) -> Mapping:
         return self._session_data["scalar_fields_info"]
 
-    def get_vector_fields_info(self) -> dict:
+    def get_vector_fields_info(self) -> Mapping:
         return self._session_data["vector_fields_info"]
 
-    def get_surfaces_info(self) -> dict:
+    def get_surfaces_info(self) -> Mapping:
         return self._session_data["surfaces_info"]
 
 
+class _FieldViews(dict):
+    """``{(tag_id, field): (rows, column)}``, each entry built on first use."""
+
+    def __init__(self, layout, arrays):
+        super().__init__()
+        self._layout = layout
+        self._arrays = arrays
+
+    def __missing__(self, key):
+        tag_id, field = key
+        rows = {
+            surface_id: slice(start, stop)
+            for surface_id, start, stop in self._layout[tag_id][field]
+        }
+        column = self._arrays[f"fields/{tag_id}/{field}"]
+        column.flags.writeable = False
+        view = self[key] = (rows, column)
+        return view
+
+
+class _ColumnarFields:
+    """Session field arrays stored as one column per tag and field.
+
+    A column concatenates the arrays of all the surfaces carrying the field,
+    its rows map every surface id to the slice of the column holding its
+    values. ``views`` holds the rows and column of each tag and field, read
+    from ``arrays`` on first use.
+    """
+
+    def __init__(self, layout, arrays):
+        self._layout = layout
+        self.views = _FieldViews(layout, arrays)
+
+    def surface_fields(self, tag_id: int, surface_id: int) -> Dict:
+        surface_fields = {}
+        for field in self._layout[tag_id]:
+            rows, column = self.views[tag_id, field]
+            if surface_id in rows:
+                surface_fields[field] = column[rows[surface_id]]
+        return surface_fields
+
+
+# The test modules are not a package, importlib.resources cannot locate the
+# fixture. __file__ is already absolute so the path needs no resolving.
+_SESSION_PATH = Path(__file__).with_name("session.dump")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _load_session():
+    skeleton = json.loads(_SESSION_PATH.with_suffix(".json").read_text())
+    # The skeleton stores the int keyed levels, tag and surface ids, as lists.
+    skeleton["range"] = {
+        field: dict(field_ranges) for field, field_ranges in skeleton["range"].items()
+    }
+    arrays = np.load(_SESSION_PATH.with_suffix(".npz"), allow_pickle=False)
+    fields = _ColumnarFields(dict(skeleton.pop("fields")), arrays)
+    return MappingProxyType(dict(_freeze(skeleton), fields=fields))
+
+
+@functools.lru_cache(maxsize=1)
+def _field_info():
+    return MockFieldInfo(_load_session())
+
+
 class MockAPIHelper:
-    _session_data = None
-    _session_dump = "tests//session.dump"
+    __slots__ = ()
 
     def __init__(self, obj=None):
-        if not MockAPIHelper._session_data:
-            with open(
-                str(Path(MockAPIHelper._session_dump).resolve()),
-                "rb",
-            ) as pickle_obj:
-                MockAPIHelper._session_data = pickle.load(pickle_obj)
-        self.field_info = lambda: MockFieldInfo(MockAPIHelper._session_data)
-        self.field_data = lambda: MockFieldData(
-            MockAPIHelper._session_data, self.field_info
-        )
-        self.id = lambda: 1
+        _load_session()
+
+    def field_info(self):
+        # Field info only reads the session data so a single instance, along
+        # with its range tables, is shared. Field data queues requests and is
+        # created afresh.
+        return _field_info()
+
+    def field_data(self):
+        return MockFieldData(_load_session(), self.field_info)
+
+    def id(self):
+        return 1
+
+
+@pytest.fixture(scope="module")
+def pyvista_graphics():
+    return Graphics(session=None, post_api_helper=MockAPIHelper)
+
 
+@pytest.fixture(scope="module")
+def matplotlib_plots():
+    return Plots(session=None, post_api_helper=MockAPIHelper)
 
-def test_field_api():
-    pyvista_graphics = Graphics(session=None, post_api_helper=MockAPIHelper)
+
+def test_field_api(pyvista_graphics):
     contour1 = pyvista_graphics.Contours["contour-1"]
 
     field_info = contour1._api_helper.field_info()
     field_data = contour1._api_helper.field_data()
 
-    surfaces_id = [
-        v["surface_id"][0] for k, v in field_info.get_surfaces_info().items()
-    ]
+    surfaces_id = field_info.surface_id_array()
 
     # Get vertices
     vertices_data = field_data.get_surface_data("wall", SurfaceDataType.Vertices)
@@ -259,8 +381,7 @@ def test_graphics_operations():
     assert list(pyvista_graphics1.Contours) == ["contour-1", "contour-2"]
 
 
-def test_contour_object():
-    pyvista_graphics = Graphics(session=None)
+def test_contour_object(pyvista_graphics):
     contour1 = pyvista_graphics.Contours["contour-1"]
     field_info = contour1._api_helper.field_info()
 
@@ -351,8 +472,7 @@ def test_contour_object():
     assert range[1] == pytest.approx(contour1.range.auto_range_off.maximum())
 
 
-def test_vector_object():
-    pyvista_graphics = Graphics(session=None)
+def test_vector_object(pyvista_graphics):
     vector1 = pyvista_graphics.Vectors["contour-1"]
     field_info = vector1._api_helper.field_info()
 
@@ -389,8 +509,7 @@ def test_vector_object():
     )
 
 
-def test_surface_object():
-    pyvista_graphics = Graphics(session=None)
+def test_surface_object(pyvista_graphics):
     surf1 = pyvista_graphics.Surfaces["surf-1"]
     field_info = surf1._api_helper.field_info()
 
@@ -462,8 +581,7 @@ def test_create_plot_objects():
     assert list(matplotlib_plots1.XYPlots) == ["p-1", "p-2"]
 
 
-def test_xyplot_object():
-    matplotlib_plots = Plots(session=None, post_api_helper=MockAPIHelper)
+def test_xyplot_object(matplotlib_plots):
     p1 = matplotlib_plots.XYPlots["p-1"]
     field_info = p1._api_helper.field_info()
 
@@ -513,3 +631,16 @@ def test_get_set_config():
         "zy",
         "isometric",
     }
+
+
+def test_session_fixture_matches_dump():
+    # session.json and session.npz are generated from session.dump, which
+    # stays the source of truth.
+    with _SESSION_PATH.open("rb") as pickle_obj:
+        skeleton, arrays = split_session(pickle.load(pickle_obj))
+    session_json = json.loads(_SESSION_PATH.with_suffix(".json").read_text())
+    assert session_json == json.loads(json.dumps(skeleton))
+    with np.load(_SESSION_PATH.with_suffix(".npz"), allow_pickle=False) as npz:
+        assert sorted(npz.files) == sorted(arrays)
+        for key, array in arrays.items():
+            np.testing.assert_array_equal(npz[key], array)